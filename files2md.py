@@ -14,46 +14,72 @@ Changes in this version
 Dependencies
 ------------
 - pdfminer.six     : PDF text extraction
-- pdf2image        : PDF → image conversion (for OCR fallback)
+- poppler-utils    : pdftoppm renders pages for the OCR fallback
+- ocrmypdf         : (optional) faster OCR fallback, used when on PATH
 - pytesseract      : OCR on PDF images
 - pypandoc         : DOCX → Markdown conversion
 - python-pptx      : PPTX text extraction
-- pandas + openpyxl: XLSX → Markdown tables
+- openpyxl         : XLSX → Markdown tables (read-only mode)
+- pandas + numpy   : TSV → Markdown tables
 """
 
 import argparse
+import multiprocessing
 import os
 import re
+import shutil
+import subprocess
 import sys
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import closing
+from typing import TYPE_CHECKING
 
-from pdf2image import convert_from_path
-from pdfminer.high_level import extract_text
-import pandas as pd
-import pypandoc
-import pytesseract
+# Third-party converters are imported inside the functions that use them, so
+# `--help` and plain-text jobs never pay for loading pandas, pdfminer & co.
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import Synchronized
 
-# Optional PPTX support
-try:
-    from pptx import Presentation
-except ImportError:
-    Presentation = None  # handled gracefully at runtime
+    import pandas as pd
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 
 # --------------------------------------------------------------------------- #
 #  Filename-matching presets
 # --------------------------------------------------------------------------- #
 
-CODE_FILE_PATTERN = (
-    r'\.(py|js|java|c|cpp|h|hpp|cs|rb|go|rs|php|html|css|sql|sh|bash|ps1|rkt|hs|'
-    r'scala|ml|elm|clj|ex|exs|erl|fs|fsx|lisp|scm|sml|swift|kt|kts|groovy|pl|pm|'
-    r't|lua|jl|dart|d|nim|cr|r|R|asm|s|zig|v|ada|f90|f95|f03|f08|pas|cob|cobol|'
-    r'vb|vba|vbs|tcl|hx|m|mm|ts|coffee|ls|cljc|cljs|raku|bf|md|txt)$'
-    r'|^(Makefile|Dockerfile|Rakefile|Gemfile|Vagrantfile|CMakeLists\.txt)$'
+CODE_FILE_EXTENSIONS = (
+    'py', 'js', 'java', 'c', 'cpp', 'h', 'hpp', 'cs', 'rb', 'go', 'rs', 'php', 'html', 'css',
+    'sql', 'sh', 'bash', 'ps1', 'rkt', 'hs', 'scala', 'ml', 'elm', 'clj', 'ex', 'exs', 'erl',
+    'fs', 'fsx', 'lisp', 'scm', 'sml', 'swift', 'kt', 'kts', 'groovy', 'pl', 'pm', 't', 'lua',
+    'jl', 'dart', 'd', 'nim', 'cr', 'r', 'R', 'asm', 's', 'zig', 'v', 'ada', 'f90', 'f95',
+    'f03', 'f08', 'pas', 'cob', 'cobol', 'vb', 'vba', 'vbs', 'tcl', 'hx', 'm', 'mm', 'ts',
+    'coffee', 'ls', 'cljc', 'cljs', 'raku', 'bf', 'md', 'txt',
 )
-DOCS_FILE_PATTERN = (
-    r'\.(md|txt|rst|tex|rtf|odt|doc|docx|pdf|epub|csv|tsv|json|xml|yaml|yml|ini|'
-    r'cfg|conf|log|pptx)$'
+CODE_FILE_BASENAMES = frozenset({
+    'Makefile', 'Dockerfile', 'Rakefile', 'Gemfile', 'Vagrantfile', 'CMakeLists.txt',
+})
+DOCS_FILE_EXTENSIONS = (
+    'md', 'txt', 'rst', 'tex', 'rtf', 'odt', 'doc', 'docx', 'pdf', 'epub', 'csv', 'tsv',
+    'json', 'xml', 'yaml', 'yml', 'ini', 'cfg', 'conf', 'log', 'pptx',
 )
 
+_CODE_SUFFIXES = tuple(f".{ext}" for ext in CODE_FILE_EXTENSIONS)
+_DOCS_SUFFIXES = tuple(f".{ext}" for ext in DOCS_FILE_EXTENSIONS)
+
+_NON_BACKTICK_RE = re.compile(r'[^`]+')
+_NON_BACKTICK_BYTES_RE = re.compile(rb'[^`]+')
+
+# PDFs whose extracted text falls below these thresholds are treated as scans
+BORN_DIGITAL_MIN_CHARS = 100
+BORN_DIGITAL_MIN_CHARS_PER_PAGE = 50
+
+# Resolution scanned pages are rendered at for OCR (grayscale)
+OCR_DPI = 150
+
+# Shared count of pending conversions, set in pool workers by _init_worker
+_pending_jobs: "Synchronized[int] | None" = None
+
 # --------------------------------------------------------------------------- #
 #  Utility helpers
 # --------------------------------------------------------------------------- #
@@ -61,11 +87,25 @@ DOCS_FILE_PATTERN = (
 
 def escape_backticks(text: str) -> str:
     """Wrap text in a back-tick fence long enough to avoid collisions."""
-    ticks = max((len(m.group(0)) for m in re.finditer(r'`+', text)), default=0) + 1
-    fence = '`' * max(3, ticks)
+    if '`' not in text:
+        fence = '```'
+    else:
+        # Splitting on everything *but* backticks leaves just the runs, in one C-level pass
+        ticks = max(map(len, _NON_BACKTICK_RE.split(text))) + 1
+        fence = '`' * max(3, ticks)
     return f"{fence}\n{text}\n{fence}"
 
 
+def escape_backticks_bytes(data: bytes) -> bytes:
+    """Byte-level :func:`escape_backticks`; the back-tick is plain ASCII in UTF-8."""
+    if b'`' not in data:
+        fence = b'```'
+    else:
+        ticks = max(map(len, _NON_BACKTICK_BYTES_RE.split(data))) + 1
+        fence = b'`' * max(3, ticks)
+    return b"%s\n%s\n%s" % (fence, data, fence)
+
+
 def escape_xml_tags(text: str, filepath: str, base_tag: str = "file-attachment") -> tuple[str, str]:
     """Wrap text in XML-like tags, avoiding collisions with closing tags in content.
 
@@ -94,6 +134,16 @@ def escape_xml_tags(text: str, filepath: str, base_tag: str = "file-attachment")
     return wrapped_content, tag_name
 
 
+def matches_code(path: str) -> bool:
+    """True if the path looks like a source file (the --name-code preset)."""
+    return path.endswith(_CODE_SUFFIXES) or os.path.basename(path) in CODE_FILE_BASENAMES
+
+
+def matches_docs(path: str) -> bool:
+    """True if the path looks like a document (the --name-docs preset)."""
+    return path.endswith(_DOCS_SUFFIXES)
+
+
 # --------------------------------------------------------------------------- #
 #  File-type converters
 # --------------------------------------------------------------------------- #
@@ -101,27 +151,185 @@ def escape_xml_tags(text: str, filepath: str, base_tag: str = "file-attachment")
 
 def extract_text_from_pdf(path: str) -> str:
     """Extract text from PDF, OCR-fallback when necessary."""
-    txt = extract_text(path)
-    if txt.strip():
+    from pdfminer.high_level import extract_text
+
+    txt: str = extract_text(path)
+    if is_born_digital(txt):
+        return txt
+
+    threads = ocr_thread_budget()
+    try:
+        with tempfile.TemporaryDirectory(prefix="files2md-") as tmp:
+            if shutil.which("ocrmypdf"):
+                ocr_txt = ocr_pdf_sidecar(path, tmp, jobs=threads)
+            else:
+                ocr_txt = ocr_pdf_pages(path, tmp, n_pages=txt.count("\f"), threads=threads)
+    except (OSError, RuntimeError) as e:
+        if not txt.strip():
+            raise
+        print(f"[files2md] ⚠️  OCR failed for {path}, keeping extracted text: {e}",
+              file=sys.stderr)
         return txt
-    images = convert_from_path(path)
-    return ''.join(pytesseract.image_to_string(img) for img in images)
+
+    # Keep whatever pdfminer found if OCR did no better
+    return ocr_txt if len(ocr_txt.strip()) >= len(txt.strip()) else txt
+
+
+def ocr_thread_budget() -> int:
+    """Number of OCR processes one conversion may run without oversubscribing.
+
+    Inside the process pool the CPUs are shared evenly between the
+    conversions still pending, so a lone scanned PDF gets every core while a
+    batch of them gets one each. Outside the pool all CPUs are available.
+    """
+    cpus = os.cpu_count() or 1
+    pending = _pending_jobs.value if _pending_jobs is not None else 1
+    return max(cpus // min(max(pending, 1), cpus), 1)
+
+
+def is_born_digital(txt: str) -> bool:
+    """True if pdfminer output looks like a real text layer rather than a scan.
+
+    Args:
+        txt: Text returned by pdfminer (pages are separated by form feeds)
+
+    Returns:
+        Whether the text is substantial enough to skip OCR entirely
+    """
+    chars = len(txt.strip())
+    pages = max(txt.count("\f"), 1)
+    return chars > BORN_DIGITAL_MIN_CHARS and chars / pages > BORN_DIGITAL_MIN_CHARS_PER_PAGE
+
+
+def ocr_pdf_sidecar(path: str, tmp: str, jobs: int = 1) -> str:
+    """OCR a PDF with ocrmypdf, reading the recognised text from its sidecar.
+
+    ocrmypdf rasterises straight from the PDF and parallelises across pages,
+    so it is preferred over :func:`ocr_pdf_pages` when installed.
+
+    Args:
+        path: Path to the PDF
+        tmp: Scratch directory for the sidecar file
+        jobs: Pages ocrmypdf may OCR in parallel
+
+    Returns:
+        The recognised text, pages separated by form feeds
+    """
+    sidecar = os.path.join(tmp, "sidecar.txt")
+    proc = subprocess.run(
+        # Only the sidecar is kept: plain PDF output skips the Ghostscript PDF/A pass
+        ["ocrmypdf", "--quiet", "--force-ocr", "-l", "eng", "--jobs", str(jobs),
+         "--output-type", "pdf", "--sidecar", sidecar, path, os.devnull],
+        capture_output=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"ocrmypdf failed ({proc.returncode}): "
+            f"{proc.stderr.decode('utf-8', 'replace').strip()}"
+        )
+    with open(sidecar, encoding="utf-8") as fh:
+        return fh.read()
+
+
+def ocr_pdf_pages(path: str, tmp: str, n_pages: int = 0, threads: int | None = None) -> str:
+    """OCR every page of a PDF with as few tesseract invocations as possible.
+
+    Pages are split into one contiguous batch per available thread. Each batch is rendered
+    by pdftoppm straight to 150 DPI grayscale TIFFs in ``tmp`` (what tesseract
+    reads best, with no PNG encode/decode or PIL round-trip) and then handed
+    to a single tesseract process through a list file, so the engine and
+    language model load once per batch rather than once per page. Batches
+    run side by side on a thread pool.
+
+    Args:
+        path: Path to the PDF
+        tmp: Scratch directory for the rendered pages
+        n_pages: Page count if known; 0 renders and OCRs everything in one batch
+        threads: How many batches may run at once (default: all CPUs)
+
+    Returns:
+        The recognised text, pages separated by form feeds
+    """
+    cpus = os.cpu_count() or 1
+    threads = cpus if threads is None else threads
+    n_batches = max(min(threads, n_pages), 1)
+    size = -(-n_pages // n_batches)  # ceiling division
+    ranges: list[tuple[int, int] | None] = [
+        (first, min(first + size - 1, n_pages)) for first in range(1, n_pages + 1, size)
+    ] if n_pages else [None]
+
+    # When other tesseracts (ours, or other pool workers') share the CPUs,
+    # stop each one from also spawning its own OpenMP threads
+    shared = len(ranges) > 1 or threads < cpus
+    env = dict(os.environ, OMP_THREAD_LIMIT="1") if shared else None
+    with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+        return "".join(ex.map(
+            lambda job: _ocr_page_range(path, tmp, job[0], job[1], env),
+            enumerate(ranges),
+        ))
+
+
+def _ocr_page_range(path: str, tmp: str, batch: int, pages: tuple[int, int] | None,
+                    env: dict[str, str] | None = None) -> str:
+    """Render one range of pages (all pages if None) and OCR them in one tesseract run."""
+    import pytesseract
+
+    prefix = os.path.join(tmp, f"batch-{batch}")
+    page_args = ["-f", str(pages[0]), "-l", str(pages[1])] if pages else []
+    proc = subprocess.run(
+        ["pdftoppm", "-r", str(OCR_DPI), "-gray", "-tiff", *page_args, path, prefix],
+        capture_output=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"pdftoppm failed ({proc.returncode}): "
+            f"{proc.stderr.decode('utf-8', 'replace').strip()}"
+        )
+
+    # pdftoppm zero-pads page numbers, so name order is page order
+    images = sorted(f for f in os.listdir(tmp) if f.startswith(f"batch-{batch}-"))
+    if not images:
+        return ""
+    list_file = f"{prefix}.txt"
+    with open(list_file, "w", encoding="utf-8") as fh:
+        fh.write("".join(f"{os.path.join(tmp, f)}\n" for f in images))
+
+    proc = subprocess.run(
+        [pytesseract.pytesseract.tesseract_cmd, list_file, "-", "-l", "eng"],
+        capture_output=True, check=False, env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"tesseract failed ({proc.returncode}): "
+            f"{proc.stderr.decode('utf-8', 'replace').strip()}"
+        )
+    return proc.stdout.decode("utf-8", "replace")
 
 
 def convert_docx_to_markdown(path: str) -> str:
     """DOCX → GitHub-flavoured Markdown via pandoc."""
+    import pypandoc
+
     try:
-        return pypandoc.convert_file(
-            path, "gfm", format="docx",
-            extra_args=["--wrap=none", "--standalone", "--markdown-headings=atx"]
+        # Run pandoc directly: its stdout is decoded exactly once, with no
+        # extra copies made by pypandoc's wrapper
+        proc = subprocess.run(
+            [pypandoc.get_pandoc_path(), "--from=docx", "--to=gfm", "--wrap=none",
+             "--standalone", "--markdown-headings=atx", path],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
         )
-    except (RuntimeError, OSError) as e:
+    except OSError as e:
         return f"Failed to convert DOCX: {e}"
+    if proc.returncode != 0:
+        return f"Failed to convert DOCX: {proc.stderr.decode('utf-8', 'replace').strip()}"
+    return proc.stdout.decode("utf-8")
 
 
 def convert_pptx_to_text(path: str) -> str:
     """Extract visible text from PPTX slides (requires python-pptx)."""
-    if Presentation is None:
+    try:
+        from pptx import Presentation
+    except ImportError:
         return ("Failed to read PPTX: python-pptx not installed "
                 "(pip install python-pptx)")
     try:
@@ -141,24 +349,93 @@ def convert_pptx_to_text(path: str) -> str:
     return "\n\n".join(slides)
 
 
+def _fmt_cell(value: object) -> str:
+    """Render one spreadsheet cell for a GFM table row."""
+    if value is None:
+        return ""
+    return str(value).replace("|", "\\|").replace("\r\n", " ").replace("\n", " ")
+
+
+def _gfm_row(cells: Iterable[str]) -> str:
+    """Join already-formatted cells into a GFM table row."""
+    return "| " + " | ".join(cells) + " |"
+
+
+def _sheet_to_markdown(ws: "ReadOnlyWorksheet") -> str:
+    """Render one read-only worksheet as a GFM table, first row as header."""
+    # The stored <dimension> is often stale or truncated; read_only iter_rows
+    # would silently stop at it (pandas resets it for the same reason)
+    ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return f"### Sheet: {ws.title}\n\n(Empty sheet)"
+
+    width = len(header)
+    blank_row = _gfm_row("" for _ in range(width))
+    lines = [_gfm_row(map(_fmt_cell, header)), _gfm_row("---" for _ in range(width))]
+    pending_blanks = 0
+    for row in rows:
+        # Formatting alone can put thousands of empty rows in a sheet's XML;
+        # hold blank rows back and only write them if real data follows
+        if all(v is None or v == "" for v in row):
+            pending_blanks += 1
+            continue
+        lines.extend(blank_row for _ in range(pending_blanks))
+        pending_blanks = 0
+        cells = [_fmt_cell(v) for v in row]
+        cells.extend("" for _ in range(width - len(cells)))
+        lines.append(_gfm_row(cells))
+    return f"### Sheet: {ws.title}\n\n" + "\n".join(lines)
+
+
 def convert_xlsx_to_markdown(path: str) -> str:
-    """Each sheet → GitHub-flavoured Markdown table."""
+    """Each sheet → GitHub-flavoured Markdown table.
+
+    The workbook is opened in openpyxl's read-only mode and rows are rendered
+    as they are streamed from the sheet XML, so no DataFrame (or cell object
+    per value) is built; only the finished Markdown lines are kept. The file
+    handle that read-only mode holds open is released even if a sheet fails.
+    """
+    from openpyxl import load_workbook
+
     try:
-        sheets = pd.read_excel(path, sheet_name=None)
+        with closing(load_workbook(path, read_only=True, data_only=True)) as wb:
+            return "\n\n".join(_sheet_to_markdown(ws) for ws in wb.worksheets)
     except Exception as e:
         return f"Failed to read XLSX: {e}"
 
-    parts = []
-    for name, df in sheets.items():
-        parts.append(f"### Sheet: {name}\n\n{df.to_markdown(index=False, tablefmt='github')}")
-    return "\n\n".join(parts)
+
+def df_to_gfm(df: "pd.DataFrame") -> str:
+    """Render a DataFrame as a GitHub-flavoured Markdown table (without the index).
+
+    Cells are stringified and escaped column-wide with NumPy's vectorised
+    string kernels (the same escaping as :func:`_fmt_cell`); each row then
+    costs a single ``str.join``, instead of tabulate's per-cell Python
+    formatting. Float columns holding only whole numbers (integer columns
+    with gaps) are shown as integers, as tabulate did.
+    """
+    import numpy as np
+
+    df = df.convert_dtypes(convert_string=False, convert_boolean=False)
+    arr = df.astype(object).where(df.notna(), "").astype(str).to_numpy(dtype=str)
+    if arr.size:  # np.char.replace fails on zero-size arrays (header-only files)
+        arr = np.char.replace(arr, "|", "\\|")
+        arr = np.char.replace(arr, "\r\n", " ")
+        arr = np.char.replace(arr, "\n", " ")
+    cols = [_fmt_cell(c) for c in df.columns]
+    lines = [_gfm_row(cols), _gfm_row("---" for _ in cols)]
+    lines.extend(_gfm_row(row) for row in arr.tolist())
+    return "\n".join(lines)
 
 
 def convert_tsv_to_markdown(path: str) -> str:
     """Convert TSV file to GitHub-flavoured Markdown table."""
+    import pandas as pd
+
     try:
         df = pd.read_csv(path, sep='\t')
-        return df.to_markdown(index=False, tablefmt='github')
+        return df_to_gfm(df)
     except Exception as e:
         return f"Failed to read TSV: {e}"
 
@@ -168,76 +445,168 @@ def convert_tsv_to_markdown(path: str) -> str:
 # --------------------------------------------------------------------------- #
 
 
-def process_files(filepaths, name_regex=None, use_xml_tags=False):
-    """Read, convert and wrap each file; return big Markdown string."""
-    out, failures = [], []
+def _init_worker(pending: "Synchronized[int]") -> None:
+    """Pool initializer: share the parent's count of unfinished conversions."""
+    global _pending_jobs
+    _pending_jobs = pending
 
-    for path in filepaths:
-        if name_regex and not re.search(name_regex, path):
-            continue
 
-        print(f"[files2md] ⌛ processing: {path}", file=sys.stderr)
-        lower = path.lower()
+def _convert_one(path: str) -> tuple[str, str | bytes | None, str]:
+    """Convert a single file to text; runs inside a worker process.
+
+    Args:
+        path: Path to the file to convert
+
+    Returns:
+        Tuple of (path, raw_content, kind) where kind is "table" for content
+        that is already a Markdown table, or "text" for anything that still needs
+        escaping. Plain-text files come back as UTF-8 bytes.
+    """
+    print(f"[files2md] ⌛ processing: {path}", file=sys.stderr)
+    lower = path.lower()
+
+    if lower.endswith(".pdf"):
+        return path, extract_text_from_pdf(path), "text"
+
+    if lower.endswith(".docx"):
+        return path, convert_docx_to_markdown(path), "text"
+
+    if lower.endswith(".pptx"):
+        return path, convert_pptx_to_text(path), "text"
+
+    if lower.endswith(".xlsx"):
+        return path, convert_xlsx_to_markdown(path), "table"
+
+    if lower.endswith(".tsv"):
+        return path, convert_tsv_to_markdown(path), "table"
+
+    # plain text or unknown
+    return path, read_text_bytes(path), "text"
+
+
+def read_text_bytes(path: str) -> bytes:
+    """Read a plain-text file as UTF-8 bytes, without decoding it when possible.
+
+    Escaping only needs to find back-ticks, so the bytes are passed through
+    as-is. They are decoded only to validate non-ASCII content, and files
+    that are not valid UTF-8 are transcoded from latin-1.
 
+    Args:
+        path: Path to the file
+
+    Returns:
+        The file content as UTF-8 with universal newlines
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+
+    if not data.isascii():
         try:
-            if lower.endswith(".pdf"):
-                raw_content = extract_text_from_pdf(path)
-
-            elif lower.endswith(".docx"):
-                raw_content = convert_docx_to_markdown(path)
-
-            elif lower.endswith(".pptx"):
-                raw_content = convert_pptx_to_text(path)
-
-            elif lower.endswith(".xlsx"):
-                raw_content = convert_xlsx_to_markdown(path)
-
-            elif lower.endswith(".tsv"):
-                raw_content = convert_tsv_to_markdown(path)
-
-            else:  # plain text or unknown
-                try:
-                    with open(path, encoding="utf-8") as fh:
-                        raw_content = fh.read()
-                except UnicodeDecodeError as e:
-                    print(f"[files2md] ⚠️  UTF-8 failed for {path}: {e}", file=sys.stderr)
-                    try:
-                        with open(path, encoding="latin-1") as fh:
-                            raw_content = fh.read()
-                    except Exception as e2:
-                        print(f"[files2md] 🚫 could not decode {path}: {e2}", file=sys.stderr)
-                        failures.append(path)
-                        continue
-
-            # Apply appropriate escaping based on mode
-            if use_xml_tags:
-                content = raw_content
-            else:
-                # For non-markdown files, apply backtick escaping
-                if lower.endswith((".xlsx", ".tsv")):
-                    content = raw_content  # These are already markdown tables
-                else:
-                    content = escape_backticks(raw_content)
+            data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            print(f"[files2md] ⚠️  UTF-8 failed for {path}: {e}", file=sys.stderr)
+            data = data.decode("latin-1").encode("utf-8")
 
-            end_comment = f"<!-- end of: {os.path.basename(path)} -->"
-            if use_xml_tags:
-                wrapped_content, tag_used = escape_xml_tags(content, path)
-                out.extend([f"## Attached file: {path}", wrapped_content, end_comment])
-            else:
-                out.extend([f"<!-- file-attachment: {path} -->",
-                            f"## Attached file: {path}", content, end_comment])
+    if b"\r" in data:  # match text-mode reads: \r\n and \r become \n
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
+
+
+def wrap_file(path: str, raw_content: str | bytes, kind: str,
+              use_xml_tags: bool = False) -> list[str | bytes]:
+    """Escape converted content and wrap it as an attachment.
+
+    Args:
+        path: Path of the source file
+        raw_content: Converted file content; UTF-8 bytes for plain-text files
+        kind: "table" if raw_content is already a Markdown table, else "text"
+        use_xml_tags: Wrap in XML-like tags instead of back-tick fences
+
+    Returns:
+        The Markdown sections for this file, to be separated by blank lines
+    """
+    if isinstance(raw_content, bytes):
+        if not use_xml_tags:
+            return [f"<!-- file-attachment: {path} -->", f"## Attached file: {path}",
+                    escape_backticks_bytes(raw_content),
+                    f"<!-- end of: {os.path.basename(path)} -->"]
+        raw_content = raw_content.decode("utf-8")
+
+    # Apply appropriate escaping based on mode
+    if use_xml_tags or kind == "table":
+        content = raw_content  # tables are already markdown
+    else:
+        content = escape_backticks(raw_content)
+
+    end_comment = f"<!-- end of: {os.path.basename(path)} -->"
+    if use_xml_tags:
+        wrapped_content, tag_used = escape_xml_tags(content, path)
+        return [f"## Attached file: {path}", wrapped_content, end_comment]
+    return [f"<!-- file-attachment: {path} -->",
+            f"## Attached file: {path}", content, end_comment]
+
+
+def stream_files(filepaths: Iterable[str], use_xml_tags: bool = False) -> Iterator[str | bytes]:
+    """Convert files in parallel; yield Markdown sections in input order as they finish.
 
-        except Exception as e:
-            print(f"[files2md] 🚫 unexpected error on {path}: {e}", file=sys.stderr)
-            failures.append(path)
+    Args:
+        filepaths: Iterable of already-filtered paths, e.g. straight from
+            :func:`find_files`; conversions start while it is still being consumed
+        use_xml_tags: Wrap in XML-like tags instead of back-tick fences
+    """
+    failures = []
+
+    # ProcessPoolExecutor only starts workers on demand (one per job while none
+    # is idle) with a non-fork start method; with fork it launches all of them
+    # on the first submit, so a one-file run would fork one worker per core.
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    pending = ctx.Value("i", 0)  # submitted but unfinished; sizes OCR fan-out
+    ex = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=ctx,
+                             initializer=_init_worker, initargs=(pending,))
+
+    def job_done(_future: Future[tuple[str, str | bytes | None, str]]) -> None:
+        with pending.get_lock():
+            pending.value -= 1
+
+    try:
+        paths: list[str] = []
+        futures = {}
+        for i, p in enumerate(filepaths):
+            paths.append(p)
+            with pending.get_lock():
+                pending.value += 1
+            future = ex.submit(_convert_one, p)
+            future.add_done_callback(job_done)
+            futures[future] = i
+        results: dict[int, tuple[str, str | bytes | None, str]] = {}
+        next_idx = 0
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                path = paths[idx]
+                print(f"[files2md] 🚫 unexpected error on {path}: {e}", file=sys.stderr)
+                results[idx] = (path, None, "failed")
+
+            # Emit every result that is now contiguous with what was already written
+            while next_idx in results:
+                path, raw_content, kind = results.pop(next_idx)
+                next_idx += 1
+                if kind == "failed" or raw_content is None:
+                    failures.append(path)
+                    continue
+                yield from wrap_file(path, raw_content, kind, use_xml_tags)
+    finally:
+        # Don't start queued conversions if the consumer stopped early
+        ex.shutdown(cancel_futures=True)
 
     if failures:
         print("\n[files2md] SUMMARY — failed files:", file=sys.stderr)
         for f in failures:
             print(f"  • {f}", file=sys.stderr)
 
-    return "\n\n".join(out)
-
 
 # --------------------------------------------------------------------------- #
 #  File discovery
@@ -249,40 +618,87 @@ def is_hidden(path: str) -> bool:
     return os.path.basename(path).startswith(".")
 
 
-def find_files(paths, *, recursive=False, include_hidden=False, name_regex=None):
-    """Resolve all input paths to a flat list of filepaths."""
-    results = []
+def _scan_dir(dirpath: str, include_hidden: bool,
+              name_filter: Callable[[str], object] | None,
+              seen: set[tuple[int, int]],
+              visited_dirs: set[tuple[int, int]]) -> tuple[list[str], list[str]]:
+    """List one directory as (matching files, subdirectories).
+
+    Uses os.scandir so file/directory checks come from the cached
+    ``DirEntry`` type information instead of one stat call per entry.
+    Hidden entries are dropped before anything else is looked at, and
+    name_filter sees only the entry's name, not its (ever longer) path.
+
+    Files and directories already in ``seen``/``visited_dirs`` (keyed by
+    device and inode) are skipped, so overlapping arguments and symlinks
+    never queue the same file twice. A regular file's key comes from
+    ``DirEntry.inode()`` plus the directory's device; only symlinks need a stat.
+    """
+    try:
+        st = os.stat(dirpath)
+        if (st.st_dev, st.st_ino) in visited_dirs:
+            return [], []
+        visited_dirs.add((st.st_dev, st.st_ino))
+        with os.scandir(dirpath) as it:
+            entries = list(it)
+    except OSError:
+        return [], []  # unreadable directory; os.walk skipped these silently too
+
+    files, subdirs = [], []
+    for entry in entries:
+        if not include_hidden and entry.name.startswith("."):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file() and (name_filter is None or name_filter(entry.name)):
+            try:
+                if entry.is_symlink():
+                    target = entry.stat()
+                    key = (target.st_dev, target.st_ino)
+                else:
+                    key = (st.st_dev, entry.inode())
+            except OSError:
+                continue
+            if key not in seen:
+                seen.add(key)
+                files.append(entry.path)
+    return files, subdirs
+
+
+def _walk(dirpath: str, include_hidden: bool,
+          name_filter: Callable[[str], object] | None,
+          seen: set[tuple[int, int]], visited_dirs: set[tuple[int, int]]) -> Iterator[str]:
+    """Yield matching files under dirpath, in the same order as os.walk."""
+    files, subdirs = _scan_dir(dirpath, include_hidden, name_filter, seen, visited_dirs)
+    yield from files
+    for subdir in subdirs:
+        yield from _walk(subdir, include_hidden, name_filter, seen, visited_dirs)
+
+
+def find_files(paths: Iterable[str], *, recursive: bool = False, include_hidden: bool = False,
+               name_filter: Callable[[str], object] | None = None) -> Iterator[str]:
+    """Lazily resolve all input paths to distinct, filtered filepaths."""
+    seen: set[tuple[int, int]] = set()
+    visited_dirs: set[tuple[int, int]] = set()
 
     for path in paths:
         if not include_hidden and is_hidden(path):
             continue
 
         if os.path.isfile(path):
-            results.append(path)
+            if name_filter is not None and not name_filter(os.path.basename(path)):
+                continue
+            st = os.stat(path)
+            if (st.st_dev, st.st_ino) not in seen:
+                seen.add((st.st_dev, st.st_ino))
+                yield path
 
         elif os.path.isdir(path):
             if recursive:
-                for root, dirs, files in os.walk(path):
-                    if not include_hidden:
-                        # prune hidden directories in-place
-                        dirs[:] = [d for d in dirs if not d.startswith(".")]
-                        files = [f for f in files if not f.startswith(".")]
-                    for fname in files:
-                        fpath = os.path.join(root, fname)
-                        if include_hidden or not is_hidden(fpath):
-                            if name_regex is None or re.search(name_regex, fpath):
-                                results.append(fpath)
+                yield from _walk(path, include_hidden, name_filter, seen, visited_dirs)
             else:
-                for fname in os.listdir(path):
-                    if not include_hidden and fname.startswith("."):
-                        continue
-                    fpath = os.path.join(path, fname)
-                    if os.path.isfile(fpath) and (
-                        name_regex is None or re.search(name_regex, fpath)
-                    ):
-                        results.append(fpath)
-
-    return results
+                files, _ = _scan_dir(path, include_hidden, name_filter, seen, visited_dirs)
+                yield from files
 
 
 # --------------------------------------------------------------------------- #
@@ -290,12 +706,7 @@ def find_files(paths, *, recursive=False, include_hidden=False, name_regex=None)
 # --------------------------------------------------------------------------- #
 
 
-def main():
-    try:
-        pypandoc.get_pandoc_version()
-    except OSError:
-        print("Warning: pandoc not found – DOCX conversion disabled.", file=sys.stderr)
-
+def main() -> None:
     ap = argparse.ArgumentParser(
         description="Combine files into a single Markdown document."
     )
@@ -313,33 +724,61 @@ def main():
         "--exclude-hidden-files", action="store_false", dest="include_hidden",
         help="(Default) Skip dotfiles.", default=False
     )
-    ap.add_argument("--name-regex", help="Regex to filter filenames.")
+    ap.add_argument("--name-regex",
+                    help="Regex to filter filenames (matched against the base name).")
     ap.add_argument("--name-code", action="store_true",
-                    help="Use preset regex for common code files.")
+                    help="Use preset filter for common code files.")
     ap.add_argument("--name-docs", action="store_true",
-                    help="Use preset regex for common document files.")
+                    help="Use preset filter for common document files.")
     ap.add_argument("--xml-tags", action="store_true",
                     help="Use XML-like tags instead of backtick fences "
                          "(defaults to <file-attachment>).")
     args = ap.parse_args()
 
+    import pypandoc
+
+    try:
+        pypandoc.get_pandoc_version()
+    except OSError:
+        print("Warning: pandoc not found – DOCX conversion disabled.", file=sys.stderr)
+
     if sum(map(bool, (args.name_regex, args.name_code, args.name_docs))) > 1:
         ap.error("Choose only one of --name-regex / --name-code / --name-docs.")
 
-    regex = (
-        args.name_regex if args.name_regex else
-        CODE_FILE_PATTERN if args.name_code else
-        DOCS_FILE_PATTERN if args.name_docs else
-        None
-    )
+    name_filter: Callable[[str], object] | None
+    if args.name_regex:
+        try:
+            name_filter = re.compile(args.name_regex).search
+        except re.error as e:
+            ap.error(f"Invalid --name-regex: {e}")
+    else:
+        name_filter = (
+            matches_code if args.name_code else
+            matches_docs if args.name_docs else
+            None
+        )
 
     files = find_files(
         args.paths,
         recursive=args.recursive,
         include_hidden=args.include_hidden,
-        name_regex=regex,
+        name_filter=name_filter,
     )
-    print(process_files(files, name_regex=regex, use_xml_tags=args.xml_tags))
+    # Output is always UTF-8; plain-text files are written through as raw bytes
+    write = sys.stdout.buffer.write
+    try:
+        for i, chunk in enumerate(
+            stream_files(files, use_xml_tags=args.xml_tags)
+        ):
+            if i:
+                write(b"\n\n")
+            write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+        write(b"\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":